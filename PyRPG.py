@@ -4,6 +4,7 @@ import random
 import time
 import json
 import os
+import hashlib
 from collections import defaultdict
 import itertools
 
@@ -16,15 +17,28 @@ WHITE = (255, 255, 255)
 RED = (255, 0, 0)
 GREEN = (0, 255, 0)
 YELLOW = (255, 255, 0)
+MAP_RELOAD_INTERVAL = 0.5  # seconds between maps.json checks in dev mode
+# Errors from reading or parsing maps.json (ValueError covers bad JSON)
+MAP_LOAD_ERRORS = (OSError, KeyError, TypeError, IndexError, ValueError)
+FOV_RADIUS = 8  # tiles the player can see
+TILE_COLORS = {'W': (128, 128, 128), 'D': (139, 69, 19), 'O': (205, 133, 63)}
+FLOOR_COLOR = (24, 24, 24)  # floor inside the field of view
+# Explored tiles outside the field of view are drawn dimmed
+MEMORY_COLORS = {cell: tuple(c // 3 for c in color) for cell, color in TILE_COLORS.items()}
+MEMORY_FLOOR_COLOR = (10, 10, 10)
+# Octant transforms (xx, xy, yx, yy) for shadowcasting
+FOV_OCTANTS = ((1, 0, 0, 1), (0, 1, 1, 0), (0, -1, 1, 0), (-1, 0, 0, 1),
+               (-1, 0, 0, -1), (0, -1, -1, 0), (0, 1, -1, 0), (1, 0, 0, -1))
 
 # New Item class
 class Item:
-    def __init__(self, name, effect, symbol, color, quantity=1):
+    def __init__(self, name, effect, symbol, color, quantity=1, spawn_index=None):
         self.name = name
         self.effect = effect
         self.symbol = symbol
         self.color = color
         self.quantity = quantity
+        self.spawn_index = spawn_index  # map spawn this item came from, if any
 
     def use(self, character):
         if self.effect == 'heal':
@@ -78,10 +92,9 @@ class Character:
 
     def is_valid_move(self, new_pos, game_map):
         x, y = new_pos
-        return (0 <= x < len(game_map[0]) and 
-                0 <= y < len(game_map) and 
-                game_map[y][x] != 'W' and
-                game_map[y][x] != 'D')  # Add 'D' to collision check
+        return (0 <= x < game_map.width and 
+                0 <= y < game_map.height and 
+                game_map.cell(x, y) not in BLOCKING_TILES)
 
     def use_item(self, item_name):
         item = self.inventory.get_item_by_name(item_name)
@@ -103,11 +116,12 @@ class Player(Character):
 
 # Update Enemy class
 class Enemy(Character):
-    def __init__(self, name, pos, health, speed, damage_range):
+    def __init__(self, name, pos, health, speed, damage_range, spawn_index=None):
         super().__init__(pos, health)
         self.name = name
         self.speed = speed
         self.damage_range = damage_range
+        self.spawn_index = spawn_index  # map spawn this enemy came from, if any
 
     def attack(self):
         return random.randint(*self.damage_range)
@@ -118,24 +132,116 @@ class Enemy(Character):
 
 # Create specific enemy types
 class Goblin(Enemy):
-    def __init__(self, pos):
-        super().__init__("Goblin", pos, health=20, speed=4, damage_range=(2, 6))
+    def __init__(self, pos, spawn_index=None):
+        super().__init__("Goblin", pos, health=20, speed=4, damage_range=(2, 6), spawn_index=spawn_index)
 
 class Orc(Enemy):
-    def __init__(self, pos):
-        super().__init__("Orc", pos, health=35, speed=3, damage_range=(4, 8))
+    def __init__(self, pos, spawn_index=None):
+        super().__init__("Orc", pos, health=35, speed=3, damage_range=(4, 8), spawn_index=spawn_index)
 
 class Skeleton(Enemy):
-    def __init__(self, pos):
-        super().__init__("Skeleton", pos, health=15, speed=5, damage_range=(3, 7))
+    def __init__(self, pos, spawn_index=None):
+        super().__init__("Skeleton", pos, health=15, speed=5, damage_range=(3, 7), spawn_index=spawn_index)
 
 class Dragon(Enemy):
-    def __init__(self, pos):
-        super().__init__("Dragon", pos, health=100, speed=7, damage_range=(10, 20))
+    def __init__(self, pos, spawn_index=None):
+        super().__init__("Dragon", pos, health=100, speed=7, damage_range=(10, 20), spawn_index=spawn_index)
+
+# Map symbols that spawn an entity instead of being a tile
+ENEMY_TYPES = {'g': Goblin, 'o': Orc, 's': Skeleton, 'd': Dragon}
+ITEM_SYMBOLS = {'H'}
+BLOCKING_TILES = ('W', 'D', 'O')  # walls and doors, open or not
+
+# Per-session changes layered over an immutable map template
+class MapState:
+    def __init__(self, template):
+        self.template = template
+        self.changed_tiles = {}  # {y: {x: cell}}
+        self.removed_spawns = set()
+        self.version = 0  # bumped on every tile change
+        self.width = len(self.template['layout'][0])
+        self.height = len(self.template['layout'])
+        self.explored = bytearray((self.width * self.height + 7) // 8)  # 1 bit per tile
+
+    def cell(self, x, y):
+        changes = self.changed_tiles.get(y)
+        if changes and x in changes:
+            return changes[x]
+        return self.template['layout'][y][x]
+
+    def set_tile(self, x, y, cell):
+        if self.cell(x, y) == cell:
+            return
+        self.version += 1
+        if self.template['layout'][y][x] == cell:
+            row_changes = self.changed_tiles[y]
+            del row_changes[x]
+            if not row_changes:
+                del self.changed_tiles[y]
+        else:
+            self.changed_tiles.setdefault(y, {})[x] = cell
+
+    def active_spawns(self):
+        for index, (symbol, pos) in enumerate(self.template['spawns']):
+            if index not in self.removed_spawns:
+                yield index, symbol, pos
+
+    def is_explored(self, x, y):
+        i = y * self.width + x
+        return bool(self.explored[i >> 3] & (1 << (i & 7)))
+
+    def mark_explored(self, x, y):
+        i = y * self.width + x
+        self.explored[i >> 3] |= 1 << (i & 7)
+
+    def compute_fov(self, origin, radius):
+        # Recursive shadowcasting; only 'W' tiles block line of sight
+        ox, oy = origin
+        visible = set()
+        if 0 <= ox < self.width and 0 <= oy < self.height:
+            visible.add((ox, oy))
+
+        def cast(row, start, end, xx, xy, yx, yy):
+            if start < end:
+                return
+            new_start = start
+            for j in range(row, radius + 1):
+                dx, dy = -j - 1, -j
+                blocked = False
+                while dx <= 0:
+                    dx += 1
+                    x = ox + dx * xx + dy * xy
+                    y = oy + dx * yx + dy * yy
+                    l_slope = (dx - 0.5) / (dy + 0.5)
+                    r_slope = (dx + 0.5) / (dy - 0.5)
+                    if start < r_slope:
+                        continue
+                    elif end > l_slope:
+                        break
+                    in_bounds = 0 <= x < self.width and 0 <= y < self.height
+                    if in_bounds and dx * dx + dy * dy <= radius * radius:
+                        visible.add((x, y))
+                    wall = not in_bounds or self.cell(x, y) == 'W'
+                    if blocked:
+                        if wall:
+                            new_start = r_slope
+                        else:
+                            blocked = False
+                            start = new_start
+                    elif wall and j < radius:
+                        blocked = True
+                        cast(j + 1, start, l_slope, xx, xy, yx, yy)
+                        new_start = r_slope
+                if blocked:
+                    break
+
+        for octant in FOV_OCTANTS:
+            cast(1, 1.0, 0.0, *octant)
+        return visible
 
 # Update Game class
 class Game:
-    def __init__(self):
+    def __init__(self, dev_mode=False):
         pygame.init()
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
         pygame.display.set_caption('PyRPG 1.4')
@@ -143,13 +249,17 @@ class Game:
         self.font = pygame.font.Font(None, 36)
         self.small_font = pygame.font.Font(None, 24)
 
+        self.dev_mode = dev_mode
+        self.maps_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'maps.json')
+        self.last_map_check = 0
         self.maps = self.load_maps()
+        self.map_states = {}
         self.current_map_index = 0
-        self.game_map = self.maps[self.current_map_index]['layout']
-        self.items_on_map = defaultdict(list)
-        self.load_items()
+        self.enter_map(self.current_map_index)
         self.player = Player(self.find_player_start())
-        self.enemies = self.create_enemies()
+        self.visible_tiles = set()
+        self.visibility_key = None
+        self.memory_surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
 
         self.running = True
         self.game_started = False
@@ -175,62 +285,208 @@ class Game:
         self.show_battle_log = False
         self.battle_log = []  # Store all battle messages here
 
+    def read_maps_file(self):
+        self.maps_mtime = os.path.getmtime(self.maps_path)
+        with open(self.maps_path, 'r') as f:
+            data = json.load(f)
+            maps = data['maps']
+        if not isinstance(maps, list) or not maps:
+            raise ValueError("'maps' must be a non-empty list")
+        return maps
+
+    def hash_map(self, map_data):
+        return hashlib.sha1(json.dumps(map_data, sort_keys=True).encode()).hexdigest()
+
     def load_maps(self):
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        maps_path = os.path.join(script_dir, 'maps.json')
         try:
-            with open(maps_path, 'r') as f:
-                data = json.load(f)
-                maps = data['maps']
-                for map_data in maps:
-                    map_data['layout'] = [list(row) for row in map_data['layout']]
-                return maps
-        except (FileNotFoundError, json.JSONDecodeError, KeyError) as e:
+            maps_data = self.read_maps_file()
+            map_hashes = [self.hash_map(map_data) for map_data in maps_data]
+            maps = [self.parse_map(map_data) for map_data in maps_data]
+        except MAP_LOAD_ERRORS as e:
             print(f"Error loading maps: {e}")
             sys.exit(1)
+        self.map_hashes = map_hashes
+        return maps
+
+    def check_for_map_reload(self):
+        # Dev mode only: poll maps.json and reload it when it changes on disk
+        if not self.dev_mode:
+            return
+        current_time = time.time()
+        if current_time - self.last_map_check < MAP_RELOAD_INTERVAL:
+            return
+        self.last_map_check = current_time
+        try:
+            if os.path.getmtime(self.maps_path) == self.maps_mtime:
+                return
+        except OSError:
+            return
+        self.reload_maps()
+
+    def reload_maps(self):
+        # Templates are matched by hash, so inserting or reordering maps only
+        # re-parses the maps whose contents actually changed
+        old_indices = defaultdict(list)
+        for index, map_hash in enumerate(self.map_hashes):
+            old_indices[map_hash].append(index)
+
+        # Keep the old maps if anything in the file is broken
+        try:
+            maps_data = self.read_maps_file()
+            map_hashes = [self.hash_map(map_data) for map_data in maps_data]
+            maps = []
+            kept = {}  # new index -> old index
+            for index, (map_data, map_hash) in enumerate(zip(maps_data, map_hashes)):
+                if old_indices[map_hash]:
+                    kept[index] = old_indices[map_hash].pop(0)
+                    maps.append(self.maps[kept[index]])
+                else:
+                    maps.append(self.parse_map(map_data))
+        except MAP_LOAD_ERRORS as e:
+            print(f"Error reloading maps: {e}")
+            return
+        parsed = len(maps) - len(kept)
+        if not parsed and len(maps) == len(self.maps) and all(new == old for new, old in kept.items()):
+            return
+        self.maps = maps
+        self.map_hashes = map_hashes
+
+        # Session changes follow their map; those of changed maps are dropped
+        # because they refer to the old template
+        self.map_states = {new: self.map_states[old] for new, old in kept.items()
+                           if old in self.map_states}
+
+        moved_to = {old: new for new, old in kept.items()}
+        if self.current_map_index in moved_to:
+            self.current_map_index = moved_to[self.current_map_index]
+        else:
+            if self.current_map_index >= len(self.maps):
+                self.current_map_index = 0
+            self.enter_map(self.current_map_index)
+            self.in_battle = False
+            self.current_enemy = None
+            if not self.player.is_valid_move(self.player.pos, self.map_state):
+                self.player.pos = self.find_player_start()
+        self.add_message(f"Reloaded maps: {parsed} changed, {len(self.maps)} total")
+
+    def parse_map(self, map_data):
+        # Split spawn symbols out of the layout so the template never changes
+        layout = []
+        spawns = []
+        player_start = None
+        rows = map_data['layout']
+        if not isinstance(rows, list) or not rows:
+            raise ValueError(f"map {map_data.get('name')!r} has an empty layout")
+        if not all(isinstance(row, str) for row in rows):
+            raise TypeError(f"map {map_data.get('name')!r} layout rows must be strings")
+        if not rows[0] or any(len(row) != len(rows[0]) for row in rows):
+            raise ValueError(f"map {map_data.get('name')!r} layout rows must be non-empty and equal length")
+        for y, row in enumerate(rows):
+            cells = list(row)
+            for x, cell in enumerate(cells):
+                if cell == 'P':
+                    player_start = [x, y]
+                    cells[x] = ' '
+                elif cell in ENEMY_TYPES or cell in ITEM_SYMBOLS:
+                    spawns.append((cell, (x, y)))
+                    cells[x] = ' '
+            layout.append(''.join(cells))
+        if player_start is None:
+            player_start = self.default_player_start(layout)
+            if player_start is None:
+                raise ValueError(f"map {map_data.get('name')!r} has no floor tile to start on")
+        map_data['layout'] = tuple(layout)
+        map_data['spawns'] = tuple(spawns)
+        map_data['player_start'] = player_start
+        return map_data
+
+    def default_player_start(self, layout):
+        # Used when a map has no 'P': (1, 1) if it is floor, else the first floor tile
+        if len(layout) > 1 and len(layout[1]) > 1 and layout[1][1] not in BLOCKING_TILES:
+            return [1, 1]
+        for y, row in enumerate(layout):
+            for x, cell in enumerate(row):
+                if cell not in BLOCKING_TILES:
+                    return [x, y]
+        return None
+
+    def enter_map(self, index):
+        if index not in self.map_states:
+            self.map_states[index] = MapState(self.maps[index])
+        self.map_state = self.map_states[index]
+        self.enemies = self.create_enemies()
+        self.index_enemies()
+        self.load_items()
 
     def find_player_start(self):
-        for y, row in enumerate(self.game_map):
-            if 'P' in row:
-                return [row.index('P'), y]
-        return [1, 1]  # Default position if 'P' is not found
+        return list(self.maps[self.current_map_index]['player_start'])
 
     def create_enemies(self):
         enemies = []
-        for y, row in enumerate(self.game_map):
-            for x, cell in enumerate(row):
-                if cell == 'g':
-                    enemies.append(Goblin((x, y)))
-                elif cell == 'o':
-                    enemies.append(Orc((x, y)))
-                elif cell == 's':
-                    enemies.append(Skeleton((x, y)))
-                elif cell == 'd':
-                    enemies.append(Dragon((x, y)))
+        for index, symbol, pos in self.map_state.active_spawns():
+            if symbol in ENEMY_TYPES:
+                enemies.append(ENEMY_TYPES[symbol](pos, spawn_index=index))
         return enemies
 
+    def index_enemies(self):
+        # Rebuilt whenever enemies move or die so lookups by tile stay cheap
+        self.enemies_at = defaultdict(list)
+        for enemy in self.enemies:
+            self.enemies_at[tuple(enemy.pos)].append(enemy)
+
+    def visible_positions(self, entities_at):
+        # Walk whichever is smaller: the field of view or the entity index
+        if len(entities_at) < len(self.visible_tiles):
+            return [pos for pos in entities_at if pos in self.visible_tiles]
+        return [pos for pos in self.visible_tiles if pos in entities_at]
+
     def load_items(self):
-        for y, row in enumerate(self.game_map):
-            for x, cell in enumerate(row):
-                if cell == 'H':
-                    item = Item("Health Potion", "heal", 'H', RED)
-                    self.items_on_map[(x, y)].append(item)
-                    self.game_map[y][x] = ' '
+        self.items_on_map = defaultdict(list)
+        for index, symbol, pos in self.map_state.active_spawns():
+            if symbol == 'H':
+                item = Item("Health Potion", "heal", 'H', RED, spawn_index=index)
+                self.items_on_map[pos].append(item)
+
+    def update_visibility(self):
+        # Recompute only when the player moved or the layout changed
+        key = (self.map_state, self.map_state.version, tuple(self.player.pos))
+        if key == self.visibility_key:
+            return
+        self.visibility_key = key
+        self.visible_tiles = self.map_state.compute_fov(self.player.pos, FOV_RADIUS)
+        for x, y in self.visible_tiles:
+            self.map_state.mark_explored(x, y)
+        self.draw_memory()
+
+    def map_origin(self):
+        start_x = (SCREEN_WIDTH - self.map_state.width * TILE_SIZE) // 2
+        start_y = (SCREEN_HEIGHT - self.map_state.height * TILE_SIZE) // 2
+        return start_x, start_y
+
+    def draw_memory(self):
+        # Redraw remembered tiles that fit on screen onto the screen-sized cache
+        self.memory_surface.fill(BLACK)
+        start_x, start_y = self.map_origin()
+        first_x = max(0, -start_x // TILE_SIZE)
+        first_y = max(0, -start_y // TILE_SIZE)
+        last_x = min(self.map_state.width, (SCREEN_WIDTH - start_x + TILE_SIZE - 1) // TILE_SIZE)
+        last_y = min(self.map_state.height, (SCREEN_HEIGHT - start_y + TILE_SIZE - 1) // TILE_SIZE)
+        for y in range(first_y, last_y):
+            for x in range(first_x, last_x):
+                if self.map_state.is_explored(x, y):
+                    color = MEMORY_COLORS.get(self.map_state.cell(x, y), MEMORY_FLOOR_COLOR)
+                    pygame.draw.rect(self.memory_surface, color,
+                                     (start_x + x * TILE_SIZE, start_y + y * TILE_SIZE, TILE_SIZE, TILE_SIZE))
 
     def render_map(self):
-        map_width = len(self.game_map[0]) * TILE_SIZE
-        map_height = len(self.game_map) * TILE_SIZE
-        start_x = (SCREEN_WIDTH - map_width) // 2
-        start_y = (SCREEN_HEIGHT - map_height) // 2
+        self.update_visibility()
+        start_x, start_y = self.map_origin()
 
-        for y, row in enumerate(self.game_map):
-            for x, cell in enumerate(row):
-                color = {
-                    'W': (128, 128, 128),
-                    'D': (139, 69, 19),
-                }.get(cell, BLACK)
-                pygame.draw.rect(self.screen, color, 
-                                 (start_x + x * TILE_SIZE, start_y + y * TILE_SIZE, TILE_SIZE, TILE_SIZE))
+        self.screen.blit(self.memory_surface, (0, 0))
+        for x, y in self.visible_tiles:
+            color = TILE_COLORS.get(self.map_state.cell(x, y), FLOOR_COLOR)
+            pygame.draw.rect(self.screen, color, 
+                             (start_x + x * TILE_SIZE, start_y + y * TILE_SIZE, TILE_SIZE, TILE_SIZE))
 
         # Render entities (player, enemies, items) with loop display
         current_time = time.time()
@@ -238,25 +494,24 @@ class Game:
             self.entity_display_index += 1
             self.last_entity_switch_time = current_time
 
-        for y, row in enumerate(self.game_map):
-            for x, cell in enumerate(row):
-                pos = (x, y)
-                entities = []
-                if self.player.pos == list(pos):
-                    entities.append(('P', RED))
-                entities.extend((enemy.name[0], GREEN) for enemy in self.enemies if enemy.pos == list(pos))
-                entities.extend((item.symbol, item.color) for item in self.items_on_map.get(pos, []))
-
-                if entities:
-                    entity_index = self.entity_display_index % len(entities)
-                    symbol, color = entities[entity_index]
-                    pygame.draw.rect(self.screen, color, 
-                                     (start_x + x * TILE_SIZE, 
-                                      start_y + y * TILE_SIZE, TILE_SIZE, TILE_SIZE))
-                    text = self.small_font.render(symbol, True, WHITE)
-                    text_rect = text.get_rect(center=(start_x + x * TILE_SIZE + TILE_SIZE // 2, 
-                                                      start_y + y * TILE_SIZE + TILE_SIZE // 2))
-                    self.screen.blit(text, text_rect)
+        # Only entities inside the field of view are drawn
+        entities_at = defaultdict(list)
+        entities_at[tuple(self.player.pos)].append(('P', RED))
+        for pos in self.visible_positions(self.enemies_at):
+            entities_at[pos].extend((enemy.name[0], GREEN) for enemy in self.enemies_at[pos])
+        for pos in self.visible_positions(self.items_on_map):
+            entities_at[pos].extend((item.symbol, item.color) for item in self.items_on_map[pos])
+
+        for (x, y), entities in entities_at.items():
+            entity_index = self.entity_display_index % len(entities)
+            symbol, color = entities[entity_index]
+            pygame.draw.rect(self.screen, color, 
+                             (start_x + x * TILE_SIZE, 
+                              start_y + y * TILE_SIZE, TILE_SIZE, TILE_SIZE))
+            text = self.small_font.render(symbol, True, WHITE)
+            text_rect = text.get_rect(center=(start_x + x * TILE_SIZE + TILE_SIZE // 2, 
+                                              start_y + y * TILE_SIZE + TILE_SIZE // 2))
+            self.screen.blit(text, text_rect)
 
         # Render pickup message
         if self.pickup_message:
@@ -433,7 +688,9 @@ class Game:
         if self.current_enemy.health <= 0:
             self.add_battle_message(f"You defeated the {self.current_enemy.name}!")
             self.enemies.remove(self.current_enemy)
-            self.game_map[self.current_enemy.pos[1]][self.current_enemy.pos[0]] = ' '
+            self.index_enemies()
+            if self.current_enemy.spawn_index is not None:
+                self.map_state.removed_spawns.add(self.current_enemy.spawn_index)
             self.in_battle = False
             self.current_enemy = None
         else:
@@ -452,7 +709,7 @@ class Game:
             random.shuffle(directions)
             for dx, dy in directions:
                 new_x, new_y = self.player.pos[0] + dx, self.player.pos[1] + dy
-                if self.player.is_valid_move([new_x, new_y], self.game_map):
+                if self.player.is_valid_move([new_x, new_y], self.map_state):
                     self.player.pos = [new_x, new_y]
                     self.add_battle_message("You successfully ran away!")
                     self.in_battle = False
@@ -518,10 +775,14 @@ class Game:
         ]
 
         for x, y in adjacent_cells:
-            if 0 <= x < len(self.game_map[0]) and 0 <= y < len(self.game_map):
-                cell = self.game_map[y][x]
+            if 0 <= x < self.map_state.width and 0 <= y < self.map_state.height:
+                cell = self.map_state.cell(x, y)
                 if cell == 'D':
                     self.add_message("You opened the door.")
+                    self.map_state.set_tile(x, y, 'O')  # stays open when revisiting
+                    self.transition_to_next_map()
+                    return
+                elif cell == 'O':  # 'O' for an opened door
                     self.transition_to_next_map()
                     return
                 elif cell == 'B':  # 'B' for button
@@ -537,10 +798,8 @@ class Game:
 
     def transition_to_next_map(self):
         self.current_map_index = (self.current_map_index + 1) % len(self.maps)
-        self.game_map = self.maps[self.current_map_index]['layout']
+        self.enter_map(self.current_map_index)
         self.player.pos = self.find_player_start()
-        self.enemies = self.create_enemies()
-        self.load_items()
         self.add_message("You entered a new area.")
 
     def take_item(self):
@@ -549,6 +808,8 @@ class Game:
             item = self.items_on_map[player_pos][0]
             if self.player.inventory.add_item(item):
                 self.items_on_map[player_pos].pop(0)
+                if item.spawn_index is not None:
+                    self.map_state.removed_spawns.add(item.spawn_index)
                 if not self.items_on_map[player_pos]:
                     del self.items_on_map[player_pos]
                 self.add_message(f"Picked up {item.name}")
@@ -612,17 +873,20 @@ class Game:
         
         if direction:
             old_pos = self.player.pos.copy()
-            self.player.move(direction, self.game_map)
+            self.player.move(direction, self.map_state)
             if self.player.pos != old_pos:  # Only check for encounters if the player actually moved
                 self.check_for_encounter()
             for enemy in self.enemies:
-                enemy.random_move(self.game_map)
+                enemy.random_move(self.map_state)
+            self.index_enemies()
 
     def check_for_encounter(self):
+        self.update_visibility()
         player_x, player_y = self.player.pos
-        for enemy in self.enemies:
-            enemy_x, enemy_y = enemy.pos
-            if abs(player_x - enemy_x) <= 1 and abs(player_y - enemy_y) <= 1:
+        nearby = [(player_x + dx, player_y + dy) for dy in (-1, 0, 1) for dx in (-1, 0, 1)]
+        for pos in nearby:
+            if pos in self.visible_tiles and self.enemies_at.get(pos):
+                enemy = self.enemies_at[pos][0]
                 self.add_message(f"You encountered a {enemy.name}!")
                 self.in_battle = True
                 self.current_enemy = enemy
@@ -635,6 +899,7 @@ class Game:
 
     def run(self):
         while self.running:
+            self.check_for_map_reload()
             self.handle_events()
             self.screen.fill(BLACK)
             
@@ -675,11 +940,11 @@ class Game:
                 self.reset_game()
 
     def reset_game(self):
+        # Dropping the session overlays restores every map to its template
+        self.map_states = {}
         self.current_map_index = 0
-        self.game_map = self.maps[self.current_map_index]['layout']
+        self.enter_map(self.current_map_index)
         self.player = Player(self.find_player_start())
-        self.enemies = self.create_enemies()
-        self.load_items()
         self.player_dead = False
         self.in_battle = False
         self.current_enemy = None
@@ -707,5 +972,5 @@ class Game:
             self.screen.blit(message_text, text_rect)
 
 if __name__ == '__main__':
-    game = Game()
+    game = Game(dev_mode='--dev' in sys.argv)
     game.run()